@@ -59,8 +59,10 @@ def nsys_export_benchmark(report_name: str, nsys_path: str):
 def analyze_nsys_json_report(
     iteration: int, report_name: str, model_name: str, compiler: str
 ) -> profile_analysis.ModelProfile:
+    # Every run exports to a new timestamped report, a parsed profile cache would
+    # never be read back.
     return profile_analysis.analyze_profile_nvtx(
-        f".logs/{report_name}.json", iteration, model_name, compiler
+        f".logs/{report_name}.json", iteration, model_name, compiler, use_cache=False
     )
 
 
@@ -6,25 +6,82 @@ It creates an in memory report of the per operator duration profile and prints i
 from __future__ import annotations
 
 import argparse
+import array
+import concurrent.futures
+import contextlib
 import dataclasses
-import json
-from typing import Callable
-
-import tabulate
+import functools
+import hashlib
+import mmap
+import operator
+import os
+import pickle
+import tempfile
+from typing import Callable, Iterator, Sequence
+
+import ijson
+import numpy as np
+import orjson
 
 WARM_UP_ROUNDS = 1
 
+# Smallest chunk of an NVTX profile worth parsing in a separate process.
+_MIN_PARALLEL_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Bump when the pickled ProfileEntry layout changes to invalidate cached profiles.
+_PARSED_PROFILE_CACHE_VERSION = 1
+
 
 @dataclasses.dataclass
 class ProfileEntry:
     op_type: str
-    entries: list[tuple[str, int]]  # Entries of (node_name, duration)
+    # Node names and durations of each entry, stored as parallel sequences.
+    # Durations are collected into an int64 array during parsing and frozen into
+    # a numpy array sharing its buffer by `freeze` afterwards.
+    names: list[str] = dataclasses.field(default_factory=list)
+    durations: array.array | np.ndarray = dataclasses.field(
+        default_factory=lambda: array.array("q")
+    )
+    # Aggregates of `durations`, cached by `freeze`.
+    _sum: int | None = None
+    _count: int | None = None
+
+    @property
+    def frozen(self) -> bool:
+        return self._sum is not None
+
+    def freeze(self) -> None:
+        """Convert durations to an int64 array and cache the aggregates.
+
+        Must be called again whenever the entries are modified.
+        """
+        # Zero copy for both array.array and numpy array.
+        self.durations = np.asarray(self.durations, dtype=np.int64)
+        self._sum = int(self.durations.sum())
+        self._count = len(self.durations)
+
+    def discard_first(self, count: int) -> None:
+        """Discard the first `count` entries of a frozen entry."""
+        # Update the cached aggregates by the few discarded entries instead of
+        # summing up the remaining ones again.
+        self._sum -= int(self.durations[:count].sum())
+        self._count -= count
+        self.names = self.names[count:]
+        self.durations = self.durations[count:]
 
     def total_count(self, iteration: int = 1) -> int:
-        return len(self.entries) / iteration
+        if not self.frozen:
+            self.freeze()
+        return self._count / iteration
 
     def total_duration(self, iteration: int = 1) -> int:
-        return sum(entry[1] for entry in self.entries) / iteration / 1000 / 1000
+        if not self.frozen:
+            self.freeze()
+        return self._sum / iteration / 1000 / 1000
+
+
+# Sort key of frozen entries by duration, reading the cached sum directly.
+_by_total_duration = operator.attrgetter("_sum")
 
 
 @dataclasses.dataclass
@@ -33,24 +90,47 @@ class ModelProfile:
     iteration: int
     model_name: str | None = None
     compiler_name: str | None = None
+    # Raise if the entries of an op type do not split evenly across rounds,
+    # instead of discarding a possibly wrong number of warmup entries.
+    strict: bool = False
     _with_warmup: bool = True
     op_profiles_dict: dict[str, ProfileEntry] | None = dataclasses.field(init=False)
+    # "Batch-" op types are excluded from totals and diffs.
+    _non_batch_ops: list[ProfileEntry] = dataclasses.field(init=False)
+    _non_batch_total_duration: float = dataclasses.field(init=False)
 
     def __post_init__(self):
+        for op_profile in self.op_profiles:
+            if not op_profile.frozen:
+                op_profile.freeze()
         # Discard warmup rounds
         if self._with_warmup:
+            total_rounds = WARM_UP_ROUNDS + self.iteration
             for op_profile in self.op_profiles:
-                op_profile.entries = op_profile.entries[
-                    len(op_profile.entries)
-                    // (WARM_UP_ROUNDS + self.iteration)
-                    * WARM_UP_ROUNDS :
-                ]
-        sorted_op_profiles = sorted(
-            self.op_profiles, key=lambda x: x.total_duration(), reverse=True
-        )
+                entry_count = len(op_profile.durations)
+                if entry_count == 0:
+                    continue
+                # Every round runs the same nodes, so entries split evenly across rounds.
+                if self.strict and entry_count % total_rounds != 0:
+                    raise ValueError(
+                        f"{op_profile.op_type} has {entry_count} entries, "
+                        f"which is not a multiple of {total_rounds} rounds"
+                    )
+                per_round_count = entry_count // total_rounds
+                op_profile.discard_first(per_round_count * WARM_UP_ROUNDS)
+        # Keep op profiles sorted by duration, the dict preserves this order.
+        self.op_profiles = sorted(self.op_profiles, key=_by_total_duration, reverse=True)
         self.op_profiles_dict = {
-            op_profile.op_type: op_profile for op_profile in sorted_op_profiles
+            op_profile.op_type: op_profile for op_profile in self.op_profiles
         }
+        self._non_batch_ops = [
+            op_profile
+            for op_profile in self.op_profiles
+            if not op_profile.op_type.startswith("Batch-")
+        ]
+        self._non_batch_total_duration = sum(
+            op_profile.total_duration(self.iteration) for op_profile in self._non_batch_ops
+        )
 
     def filter_op_profiles(self, op_types: set[str]) -> ModelProfile:
         """Return a new ModelProfile with only the op types in op_types."""
@@ -59,6 +139,7 @@ class ModelProfile:
             self.iteration,
             self.model_name,
             self.compiler_name,
+            self.strict,
             _with_warmup=False,
         )
 
@@ -79,31 +160,85 @@ class ModelProfile:
     def total_op_count(self) -> int:
         return sum(op_profile.total_count(self.iteration) for op_profile in self.op_profiles)
 
+    @property
+    def non_batch_op_profiles(self) -> Sequence[ProfileEntry]:
+        """Op profiles sorted by duration, excluding "Batch-" op types."""
+        return tuple(self._non_batch_ops)
+
     def total_duration(self) -> float:
         """Total duration of all ops in the model in ms."""
-        return sum(
-            op_profile.total_duration(self.iteration)
-            for op_profile in self.op_profiles
-            if not op_profile.op_type.startswith("Batch-")
-        )
+        return self._non_batch_total_duration
 
     @property
     def sorted_op_report(self) -> str:
-        sorted_op_profiles = sorted(
-            self.op_profiles, key=lambda x: x.total_duration(), reverse=True
-        )
         return "\n".join(
             f"Node {op_profile.op_type} has {op_profile.total_count(self.iteration)} instances "
             f"and total duration {op_profile.total_duration(self.iteration)} ms"
-            for op_profile in sorted_op_profiles
+            for op_profile in self.op_profiles_dict.values()
         )
 
 
-def tabulate_diff(
+def _render_grid(rows: list[dict[str, object]]) -> str:
+    """Render rows as a grid table with the keys of the first row as headers.
+
+    Text columns are left aligned and numeric columns right aligned, floats are
+    formatted with the "g" format.
+    """
+    if not rows:
+        return ""
+    headers = list(rows[0])
+    body = [
+        [
+            format(value, "g") if isinstance(value, float) else str(value)
+            for value in row.values()
+        ]
+        for row in rows
+    ]
+    widths = [
+        max(len(header), *(len(cells[i]) for cells in body))
+        for i, header in enumerate(headers)
+    ]
+    aligns = ["<" if isinstance(value, str) else ">" for value in rows[0].values()]
+    row_format = "| " + " | ".join(f"{{:{a}{w}}}" for a, w in zip(aligns, widths)) + " |"
+    separator = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    lines = [
+        separator,
+        row_format.format(*headers),
+        separator.replace("-", "="),
+    ]
+    for cells in body:
+        lines.append(row_format.format(*cells))
+        lines.append(separator)
+    return "\n".join(lines)
+
+
+_format_percent = "{:.2f}%".format
+
+
+def _diff_percent(base: float, comp: float) -> str:
+    if not base or not comp:
+        return "N/A"
+    return _format_percent((comp - base) / base * 100)
+
+
+def _diff_percent_num(base: float, comp: float) -> float:
+    return (comp - base) / base * 100 if base else float("nan")
+
+
+def diff_report_rows(
     base_report: ModelProfile,
     comp_report: ModelProfile,
     additional_row_lambdas: list[tuple[str, Callable, Callable]] | None = None,
-) -> str:
+    numeric: bool = False,
+) -> list[dict[str, object]]:
+    """Compare the per op type profiles of two reports.
+
+    Returns one row per op type, sorted by the duration difference, then the total
+    and additional rows. "Diff%" is a float when `numeric` is True, otherwise a
+    formatted string for display. They differ for an op type missing from a report:
+    the float is NaN without base duration and -100.0 without compared duration,
+    while the string is "N/A" for both.
+    """
     base_compiler = base_report.compiler_name
     comp_compiler = comp_report.compiler_name
 
@@ -115,8 +250,7 @@ def tabulate_diff(
     def _diff(base, comp):
         return comp - base
 
-    def _diff_percent(base, comp):
-        return f"{(comp - base) / base * 100:.2f}%" if base and comp else "N/A"
+    diff_percent = _diff_percent_num if numeric else _diff_percent
 
     def _construct_tabulate_dict(
         op_type: str,
@@ -128,30 +262,33 @@ def tabulate_diff(
         return {
             "OpType": op_type,
             "Diff": _diff(base_perf, comp_perf),
-            "Diff%": _diff_percent(base_perf, comp_perf),
+            "Diff%": diff_percent(base_perf, comp_perf),
             base_compiler_count_header: base_count,
             comp_compiler_count_header: comp_count,
             base_compiler_perf_header: base_perf,
             comp_compiler_perf_header: comp_perf,
         }
 
-    ## Every op type
-    tabulate_data = sorted(
-        [
-            _construct_tabulate_dict(
-                op_type,
-                base_report.op_count(op_type),
-                comp_report.op_count(op_type),
-                base_report.op_duration(op_type),
-                comp_report.op_duration(op_type),
+    def _op_totals(report: ModelProfile) -> dict[str, tuple[int, float]]:
+        return {
+            op_profile.op_type: (
+                int(op_profile.total_count(report.iteration)),
+                op_profile.total_duration(report.iteration),
             )
-            for op_type in set(base_report.op_profiles_dict.keys())
-            | set(comp_report.op_profiles_dict.keys())
-            if not op_type.startswith("Batch-")
-        ],
-        key=lambda x: x["Diff"],
-        reverse=True,
-    )
+            for op_profile in report.non_batch_op_profiles
+        }
+
+    ## Every op type
+    base_totals = _op_totals(base_report)
+    comp_totals = _op_totals(comp_report)
+    tabulate_data = []
+    for op_type in base_totals.keys() | comp_totals.keys():
+        base_count, base_perf = base_totals.get(op_type, (0, 0))
+        comp_count, comp_perf = comp_totals.get(op_type, (0, 0))
+        tabulate_data.append(
+            _construct_tabulate_dict(op_type, base_count, comp_count, base_perf, comp_perf)
+        )
+    tabulate_data.sort(key=lambda x: x["Diff"], reverse=True)
     tabulate_data.append(
         _construct_tabulate_dict(
             "Total",
@@ -172,22 +309,44 @@ def tabulate_diff(
                     duration_lambda(comp_report),
                 )
             )
-    return tabulate.tabulate(tabulate_data, headers="keys", tablefmt="grid")
+    return tabulate_data
+
+
+def tabulate_diff(
+    base_report: ModelProfile,
+    comp_report: ModelProfile,
+    additional_row_lambdas: list[tuple[str, Callable, Callable]] | None = None,
+) -> str:
+    return _render_grid(diff_report_rows(base_report, comp_report, additional_row_lambdas))
+
+
+@contextlib.contextmanager
+def _map_profile(profile_path: str) -> Iterator[mmap.mmap]:
+    """Memory map the profile file read only, so its content is not copied into memory."""
+    with open(profile_path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        yield mapped
 
 
 def analyze_profile(profile_path: str):
-    with open(profile_path, encoding="utf-8") as f:
-        profile = f.read()
-    profile_json = json.loads(profile)
-    report = {}
-    for entry in profile_json:
-        if entry.get("cat") != "Node" or not entry.get("dur"):
-            continue
-        op_type = entry["args"]["op_name"]
-        report.setdefault(op_type, ProfileEntry(op_type, []))
-        report[op_type].entries.append((entry["name"], entry["dur"]))
-
-    sorted_node_report = sorted(report.values(), key=lambda x: x.total_duration, reverse=True)
+    report: dict[str, ProfileEntry] = {}
+    report_get = report.get
+    with _map_profile(profile_path) as mapped:
+        # Stream events one at a time, the profile can be too large to load at once.
+        for entry in ijson.items(mapped, "item"):
+            if entry.get("cat") != "Node" or not entry.get("dur"):
+                continue
+            op_type = entry["args"]["op_name"]
+            bucket = report_get(op_type)
+            if bucket is None:
+                bucket = report[op_type] = ProfileEntry(op_type)
+            bucket.names.append(entry["name"])
+            bucket.durations.append(entry["dur"])
+    for node_report in report.values():
+        node_report.freeze()
+
+    sorted_node_report = sorted(report.values(), key=_by_total_duration, reverse=True)
     for node_report in sorted_node_report:
         print(
             f"Node {node_report.op_type} has {node_report.total_count()} instances and total duration {node_report.total_duration()} ms"
@@ -197,29 +356,280 @@ def analyze_profile(profile_path: str):
     )
 
 
+def _count_and_sum_with_bincount(
+    ids: np.ndarray, durations: np.ndarray, num_ids: int
+) -> tuple[np.ndarray, np.ndarray]:
+    counts = np.bincount(ids, minlength=num_ids)
+    sums = np.bincount(ids, weights=durations, minlength=num_ids).astype(np.int64)
+    return counts, sums
+
+
+def _count_and_sum_loop(
+    ids: np.ndarray, durations: np.ndarray, num_ids: int
+) -> tuple[np.ndarray, np.ndarray]:
+    # A single pass summing in int64, bincount sums weights in float64. Not
+    # parallel, as events of the same id would race on its counters.
+    counts = np.zeros(num_ids, np.int64)
+    sums = np.zeros(num_ids, np.int64)
+    for i in range(ids.size):
+        counts[ids[i]] += 1
+        sums[ids[i]] += durations[i]
+    return counts, sums
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_count_and_sum() -> Callable | None:
+    """Compile `_count_and_sum_loop` with numba, or return None if numba is not installed.
+
+    numba is imported here rather than at module import, as importing it is slow
+    and only profiles parsed from nvtx need the kernel.
+    """
+    try:
+        import numba  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_count_and_sum_loop)
+
+
+def _count_and_sum_by_id(
+    ids: np.ndarray, durations: np.ndarray, num_ids: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the number of events and their total duration for each id."""
+    kernel = _numba_count_and_sum()
+    if kernel is None:
+        return _count_and_sum_with_bincount(ids, durations, num_ids)
+    return kernel(ids, durations, num_ids)
+
+
+if os.environ.get("ORT_NUMBA_WARMUP") == "1":
+    # Compile ahead, or load the cached compilation, at import time.
+    _count_and_sum_by_id(np.zeros(2, np.int32), np.zeros(2, np.int64), 1)
+
+
+def _group_by_op_type(
+    op_types: list[str],
+    ids: np.ndarray,
+    names: list[str],
+    name_ids: np.ndarray,
+    durations: np.ndarray,
+) -> list[ProfileEntry]:
+    """Group flat event columns into one ProfileEntry per op type.
+
+    Args:
+        op_types: Op type of each id, indexed by id.
+        ids: Op type id of each event.
+        names: Node name of each name id, indexed by id.
+        name_ids: Node name id of each event.
+        durations: Duration of each event.
+
+    Returns:
+        Frozen ProfileEntry of each op type in `op_types`, with entries in profile order.
+    """
+    counts, sums = _count_and_sum_by_id(ids, durations, len(op_types))
+
+    # A stable sort by id lays out the entries of each op type contiguously, in
+    # their original order.
+    order = np.argsort(ids, kind="stable")
+    sorted_name_ids = name_ids[order].tolist()
+    sorted_durations = durations[order]
+    op_profiles = []
+    start = 0
+    for op_id, op_type in enumerate(op_types):
+        end = start + int(counts[op_id])
+        op_profiles.append(
+            ProfileEntry(
+                op_type,
+                [names[i] for i in sorted_name_ids[start:end]],
+                sorted_durations[start:end],
+                _sum=int(sums[op_id]),
+                _count=end - start,
+            )
+        )
+        start = end
+    return op_profiles
+
+
+def _parse_nvtx_chunk(
+    profile_path: str, chunk_start: int, chunk_end: int
+) -> tuple[list[str], array.array, array.array]:
+    """Parse the NVTX events in the lines within [chunk_start, chunk_end) of the profile.
+
+    Node names repeat in every round, so they are returned once and referred to by id,
+    which keeps the result small to send back from a worker process.
+
+    Returns:
+        Flat columns of the events: node name of each id, then node name id and
+        duration of each event.
+    """
+    name_ids: dict[str, int] = {}
+    ids = array.array("i")
+    durations = array.array("q")
+    if chunk_start >= chunk_end:
+        # Nothing to parse, an empty profile can not be memory mapped.
+        return [], ids, durations
+    with _map_profile(profile_path) as mapped:
+        mapped.seek(chunk_start)
+        position = chunk_start
+        for line in iter(mapped.readline, b""):
+            if position >= chunk_end:
+                break
+            position += len(line)
+            # Skip other events without parsing them, most lines are not NVTX events.
+            if b'"NvtxEvent"' not in line:
+                continue
+            event = orjson.loads(line).get("NvtxEvent")
+            if event is None:
+                continue
+            ids.append(name_ids.setdefault(event["Text"], len(name_ids)))
+            durations.append(int(event["EndTimestamp"]) - int(event["Timestamp"]))
+    return list(name_ids), ids, durations
+
+
+def _split_into_line_chunks(profile_path: str, num_chunks: int) -> list[int]:
+    """Return offsets splitting the profile into up to `num_chunks` ranges of whole lines."""
+    with _map_profile(profile_path) as mapped:
+        size = len(mapped)
+        boundaries = [0]
+        for i in range(1, num_chunks):
+            newline = mapped.find(b"\n", max(size * i // num_chunks, boundaries[-1]))
+            if newline == -1:
+                break
+            boundaries.append(newline + 1)
+        boundaries.append(size)
+    return boundaries
+
+
+def _parse_nvtx_profile(profile_path: str, num_workers: int) -> list[ProfileEntry]:
+    """Parse an nsys profile exported to json into frozen entries per op type.
+
+    Large profiles are split into chunks of lines which are parsed in parallel by
+    `num_workers` processes.
+    """
+    num_chunks = min(num_workers, os.path.getsize(profile_path) // _MIN_PARALLEL_CHUNK_SIZE)
+    if num_chunks > 1:
+        boundaries = _split_into_line_chunks(profile_path, num_chunks)
+        with concurrent.futures.ProcessPoolExecutor(num_chunks) as executor:
+            chunks = list(
+                executor.map(
+                    _parse_nvtx_chunk,
+                    [profile_path] * (len(boundaries) - 1),
+                    boundaries[:-1],
+                    boundaries[1:],
+                )
+            )
+    else:
+        chunks = [_parse_nvtx_chunk(profile_path, 0, os.path.getsize(profile_path))]
+
+    # Merge the chunks in profile order, remapping their node name ids to shared ones.
+    name_ids: dict[str, int] = {}
+    event_name_ids = []
+    durations = []
+    for chunk_names, chunk_name_ids, chunk_durations in chunks:
+        id_map = np.array(
+            [name_ids.setdefault(name, len(name_ids)) for name in chunk_names], dtype=np.int32
+        )
+        event_name_ids.append(id_map[np.frombuffer(chunk_name_ids, dtype=np.int32)])
+        durations.append(np.frombuffer(chunk_durations, dtype=np.int64))
+    names = list(name_ids)
+    event_name_ids = np.concatenate(event_name_ids)
+
+    # Derive the op type of each event from its node name.
+    op_type_ids: dict[str, int] = {}
+    name_op_type_ids = np.array(
+        [op_type_ids.setdefault(name.split(".", 1)[0], len(op_type_ids)) for name in names],
+        dtype=np.int32,
+    )
+    return _group_by_op_type(
+        list(op_type_ids),
+        name_op_type_ids[event_name_ids],
+        names,
+        event_name_ids,
+        np.concatenate(durations),
+    )
+
+
+def _profile_cache_key(profile_path: str) -> str:
+    """Cheap fingerprint of the profile from its size, mtime and first bytes."""
+    stat = os.stat(profile_path)
+    digest = hashlib.blake2b(
+        f"{_PARSED_PROFILE_CACHE_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+    )
+    with open(profile_path, "rb") as f:
+        digest.update(f.read(1 << 20))
+    return digest.hexdigest()
+
+
+def _load_cached_profile(cache_path: str, cache_key: str) -> list[ProfileEntry] | None:
+    """Return the cached op profiles, or None if the cache is missing, stale or broken."""
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, cached_op_profiles = pickle.load(f)
+        if cached_key != cache_key:
+            return None
+        op_profiles = [
+            ProfileEntry(op_type, names, durations)
+            for op_type, names, durations in cached_op_profiles
+        ]
+        for op_profile in op_profiles:
+            op_profile.freeze()
+    except Exception:  # pylint: disable=broad-exception-caught
+        # A corrupted cache can fail in many ways, parse the profile again instead.
+        return None
+    return op_profiles
+
+
+def _store_cached_profile(
+    cache_path: str, cache_key: str, op_profiles: list[ProfileEntry]
+) -> None:
+    """Cache the op profiles, skipping the cache if it can not be written.
+
+    Only plain data is pickled, so the cache does not depend on the module
+    ProfileEntry is loaded from, e.g. `__main__` when run as a script.
+    """
+    cached_op_profiles = [
+        (op_profile.op_type, op_profile.names, np.asarray(op_profile.durations))
+        for op_profile in op_profiles
+    ]
+    temp_path = None
+    try:
+        # Write to a temporary file first, so an interrupted run leaves no partial cache.
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((cache_key, cached_op_profiles), f, protocol=5)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
 def analyze_profile_nvtx(
     profile_path: str,
     iteration: int,
     model_name: str | None = None,
     compiler_name: str | None = None,
+    num_workers: int | None = None,
+    strict: bool = False,
+    use_cache: bool = True,
 ) -> ModelProfile:
-    report = {}
-    with open(profile_path, encoding="utf-8") as f:
-        line = f.readline()
-
-        while line:
-            entry = json.loads(line)
-            line = f.readline()
-
-            if (event := entry.get("NvtxEvent")) is None:
-                continue
-            op_type = event["Text"].split(".")[0]
-            report.setdefault(op_type, ProfileEntry(op_type, []))
-            report[op_type].entries.append(
-                (event["Text"], int(event["EndTimestamp"]) - int(event["Timestamp"]))
-            )
-
-    model_profile = ModelProfile(report.values(), iteration, model_name, compiler_name)
+    """Analyze an nsys profile exported to json.
+
+    Large profiles are parsed in parallel by `num_workers` processes, defaulting to
+    the number of CPUs. Unless `use_cache` is False, the parsed profile is cached in
+    a pickle file next to the profile and reused while the profile is unchanged.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    op_profiles = None
+    cache_path = f"{profile_path}.parsed.pkl"
+    if use_cache:
+        cache_key = _profile_cache_key(profile_path)
+        op_profiles = _load_cached_profile(cache_path, cache_key)
+    if op_profiles is None:
+        op_profiles = _parse_nvtx_profile(profile_path, num_workers)
+        if use_cache:
+            _store_cached_profile(cache_path, cache_key, op_profiles)
+    model_profile = ModelProfile(op_profiles, iteration, model_name, compiler_name, strict)
 
     print(model_profile.sorted_op_report)
     print(f"Total duration: {model_profile.total_duration()} ms")
@@ -276,16 +686,43 @@ def main():
         help="Number of iterations for nvtx profile. Help remove warmup rounds.",
         type=int,
     )
+    parser.add_argument(
+        "--num-workers",
+        "--num_workers",
+        help="Number of processes parsing nvtx profile. By default the number of CPUs.",
+        type=int,
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail if the nvtx profile entries do not split evenly across iterations.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        "--no_cache",
+        action="store_true",
+        help="Always parse the nvtx profile, instead of reusing the parsed profile cached "
+        "next to it.",
+    )
 
     args = parser.parse_args()
     profile_path = args.profile_path
     type = args.type
     iteration = args.iteration
+    num_workers = args.num_workers
+    strict = args.strict
+    use_cache = not args.no_cache
 
     if type == "ortcpu":
         analyze_profile(profile_path)
     elif type == "nvtx":
-        analyze_profile_nvtx(profile_path, iteration)
+        analyze_profile_nvtx(
+            profile_path,
+            iteration,
+            num_workers=num_workers,
+            strict=strict,
+            use_cache=use_cache,
+        )
     else:
         raise ValueError(f"Unknown profile type {type}")
 
@@ -0,0 +1,396 @@
+"""Unit tests for the profile_analysis module."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import math
+import os
+import pickle
+import tempfile
+import textwrap
+import unittest
+import unittest.mock
+
+import numpy as np
+import profile_analysis
+
+# Lines in the format of `nsys export --type json`.
+_NVTX_LINE = (
+    '{"Type":59,"NvtxEvent":{"Type":59,"Timestamp":"1000","Text":"MatMul.node_0",'
+    '"GlobalTid":"281582714626138","EndTimestamp":"1500","DomainId":"0","NsTime":true}}'
+)
+_ESCAPED_NVTX_LINE = (
+    '{"Type":59,"NvtxEvent":{"Type":59,"Timestamp":"2000","Text":"Add.node\\u005f1",'
+    '"GlobalTid":"281582714626138","EndTimestamp":"2300","DomainId":"0","NsTime":true}}'
+)
+_REORDERED_NVTX_LINE = (
+    '{"NvtxEvent":{"EndTimestamp":3700,"Text":"MatMul.node_2","Type":59,'
+    '"Extra":{"Color":1},"Timestamp":3000}}'
+)
+_CUDA_LINE = (
+    '{"Type":79,"CudaEvent":{"startNs":"1100","endNs":"1400","correlationId":5,'
+    '"deviceId":0,"kernel":{"shortName":"gemm","gridX":1}}}'
+)
+_HEADER_LINE = '{"type":"String","id":"1","value":"Text"}'
+
+
+class ProfileEntryTest(unittest.TestCase):
+    def test_totals_of_unfrozen_entry(self):
+        op_profile = profile_analysis.ProfileEntry("Add", ["a", "b"], [5_000, 7_000])
+        self.assertEqual(op_profile.total_count(), 2)
+        self.assertEqual(op_profile.total_duration(2), 0.006)
+
+
+def _profile_entry(op_type: str, count: int) -> profile_analysis.ProfileEntry:
+    return profile_analysis.ProfileEntry(
+        op_type,
+        [f"{op_type}.node_{i}" for i in range(count)],
+        [1000 * (i + 1) for i in range(count)],
+    )
+
+
+class ModelProfileTest(unittest.TestCase):
+    def test_it_discards_warmup_round_entries(self):
+        # One warmup round and two iterations, two entries per round.
+        model_profile = profile_analysis.ModelProfile([_profile_entry("MatMul", 6)], 2)
+        op_profile = model_profile.op_profiles_dict["MatMul"]
+        self.assertEqual(op_profile.names, [f"MatMul.node_{i}" for i in range(2, 6)])
+        self.assertEqual(op_profile.durations.tolist(), [3000, 4000, 5000, 6000])
+        self.assertEqual(op_profile.total_count(), 4)
+        self.assertEqual(op_profile.total_duration(), 0.018)
+        self.assertEqual(model_profile.op_count("MatMul"), 2)
+
+    def test_strict_raises_on_entries_not_splitting_evenly_across_rounds(self):
+        with self.assertRaisesRegex(ValueError, "MatMul has 7 entries"):
+            profile_analysis.ModelProfile([_profile_entry("MatMul", 7)], 2, strict=True)
+
+    def test_it_skips_ops_without_entries(self):
+        model_profile = profile_analysis.ModelProfile(
+            [_profile_entry("MatMul", 6), _profile_entry("Add", 0)], 2, strict=True
+        )
+        self.assertEqual(model_profile.op_count("Add"), 0)
+        self.assertEqual(model_profile.op_profiles_dict["Add"].names, [])
+
+    def test_filter_op_profiles_keeps_strict_and_does_not_discard_warmup_again(self):
+        model_profile = profile_analysis.ModelProfile(
+            [_profile_entry("MatMul", 6), _profile_entry("Add", 3)], 2, strict=True
+        )
+        filtered_profile = model_profile.filter_op_profiles({"MatMul"})
+        self.assertTrue(filtered_profile.strict)
+        self.assertEqual(list(filtered_profile.op_profiles_dict), ["MatMul"])
+        self.assertEqual(
+            filtered_profile.op_profiles_dict["MatMul"].durations.tolist(),
+            [3000, 4000, 5000, 6000],
+        )
+
+
+def _model_profile(
+    compiler_name: str, op_durations: dict[str, list[int]]
+) -> profile_analysis.ModelProfile:
+    """Return a profile of one warmup round and two iterations with the given durations."""
+    return profile_analysis.ModelProfile(
+        [
+            profile_analysis.ProfileEntry(op_type, [op_type] * len(durations), durations)
+            for op_type, durations in op_durations.items()
+        ],
+        2,
+        compiler_name=compiler_name,
+    )
+
+
+class TabulateDiffTest(unittest.TestCase):
+    def test_it_renders_a_grid_of_op_types_total_and_additional_rows(self):
+        # Four MatMul entries over three rounds leave a fractional count per iteration.
+        base_report = _model_profile(
+            "base", {"MatMul": [1000, 2000, 3000, 4000], "Relu": [500, 1000, 1500]}
+        )
+        comp_report = _model_profile(
+            "comp", {"MatMul": [1000, 2000, 2000], "Add": [500, 500, 500]}
+        )
+        table = profile_analysis.tabulate_diff(
+            base_report,
+            comp_report,
+            additional_row_lambdas=[
+                (
+                    "MatMul only",
+                    lambda report: report.op_count("MatMul"),
+                    lambda report: report.op_duration("MatMul"),
+                )
+            ],
+        )
+        self.assertEqual(
+            table,
+            textwrap.dedent(
+                """\
+                +-------------+----------+---------+------------+------------+----------------+----------------+
+                | OpType      |     Diff | Diff%   | base count | comp count | base perf (ms) | comp perf (ms) |
+                +=============+==========+=========+============+============+================+================+
+                | Add         |   0.0005 | N/A     |          0 |          1 |              0 |         0.0005 |
+                +-------------+----------+---------+------------+------------+----------------+----------------+
+                | Relu        | -0.00125 | N/A     |          1 |          0 |        0.00125 |              0 |
+                +-------------+----------+---------+------------+------------+----------------+----------------+
+                | MatMul      |  -0.0025 | -55.56% |          1 |          1 |         0.0045 |          0.002 |
+                +-------------+----------+---------+------------+------------+----------------+----------------+
+                | Total       | -0.00325 | -56.52% |        2.5 |          2 |        0.00575 |         0.0025 |
+                +-------------+----------+---------+------------+------------+----------------+----------------+
+                | MatMul only |  -0.0025 | -55.56% |          1 |          1 |         0.0045 |          0.002 |
+                +-------------+----------+---------+------------+------------+----------------+----------------+"""
+            ),
+        )
+
+
+class DiffReportRowsTest(unittest.TestCase):
+    def setUp(self):
+        self.base_report = _model_profile(
+            "base", {"MatMul": [1000, 2000, 2000], "Relu": [500, 1000, 1500]}
+        )
+        self.comp_report = _model_profile(
+            "comp", {"MatMul": [1000, 1000, 1000], "Add": [500, 500, 500]}
+        )
+
+    def _diff_percents(self, numeric: bool) -> dict[str, object]:
+        rows = profile_analysis.diff_report_rows(
+            self.base_report, self.comp_report, numeric=numeric
+        )
+        return {row["OpType"]: row["Diff%"] for row in rows}
+
+    def test_numeric_diff_percent_is_nan_or_minus_100_for_missing_op_types(self):
+        diff_percents = self._diff_percents(numeric=True)
+        self.assertEqual(list(diff_percents), ["Add", "MatMul", "Relu", "Total"])
+        self.assertTrue(math.isnan(diff_percents["Add"]))
+        self.assertEqual(diff_percents["MatMul"], -50.0)
+        self.assertEqual(diff_percents["Relu"], -100.0)
+        self.assertAlmostEqual(diff_percents["Total"], -100 * 1.75 / 3.25)
+
+    def test_formatted_diff_percent_is_na_for_missing_op_types(self):
+        self.assertEqual(
+            self._diff_percents(numeric=False),
+            {"Add": "N/A", "MatMul": "-50.00%", "Relu": "N/A", "Total": "-53.85%"},
+        )
+
+
+class CountAndSumByIdTest(unittest.TestCase):
+    @unittest.skipIf(profile_analysis._numba_count_and_sum() is None, "numba is not installed")
+    def test_numba_kernel_matches_bincount(self):
+        kernel = profile_analysis._numba_count_and_sum()
+        cases = {
+            "empty": ([], [], 0),
+            "empty with ids": ([], [], 3),
+            "unused id": ([2, 0, 2, 2, 0], [5, 1, 7, 3_000_000_000_000, 0], 4),
+        }
+        for case, (ids, durations, num_ids) in cases.items():
+            with self.subTest(case):
+                ids = np.array(ids, dtype=np.int32)
+                durations = np.array(durations, dtype=np.int64)
+                expected_counts, expected_sums = profile_analysis._count_and_sum_with_bincount(
+                    ids, durations, num_ids
+                )
+                counts, sums = kernel(ids, durations, num_ids)
+                self.assertEqual(counts.tolist(), expected_counts.tolist())
+                self.assertEqual(sums.tolist(), expected_sums.tolist())
+                self.assertEqual(sums.dtype, expected_sums.dtype)
+
+
+class AnalyzeProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.profile_path = os.path.join(self.temp_dir.name, "profile.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_it_reports_per_op_count_and_duration_of_node_events(self):
+        def node_event(name: str, op_name: str, dur: int) -> dict:
+            return {"cat": "Node", "name": name, "dur": dur, "args": {"op_name": op_name}}
+
+        events = [
+            {"cat": "Session", "name": "model_run", "dur": 9_000_000},
+            node_event("matmul_0", "MatMul", 3000),
+            node_event("add_0", "Add", 1000),
+            node_event("matmul_1", "MatMul", 2000),
+            node_event("add_1", "Add", 0),
+            node_event("relu_0", "Relu", 0),
+        ]
+        with open(self.profile_path, "w", encoding="utf-8") as f:
+            json.dump(events, f)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            profile_analysis.analyze_profile(self.profile_path)
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            [
+                "Node MatMul has 2.0 instances and total duration 0.005 ms",
+                "Node Add has 1.0 instances and total duration 0.001 ms",
+                "Total duration: 0.006 ms",
+            ],
+        )
+
+
+class ParseNvtxChunkTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.profile_path = os.path.join(self.temp_dir.name, "profile.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _parse(self, lines: list[str]):
+        with open(self.profile_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return profile_analysis._parse_nvtx_chunk(
+            self.profile_path, 0, os.path.getsize(self.profile_path)
+        )
+
+    def test_it_parses_nvtx_events_and_skips_other_events(self):
+        names, ids, durations = self._parse(
+            [
+                _HEADER_LINE,
+                _NVTX_LINE,
+                _CUDA_LINE,
+                _ESCAPED_NVTX_LINE,
+                _REORDERED_NVTX_LINE,
+                _NVTX_LINE,
+            ]
+        )
+        self.assertEqual(names, ["MatMul.node_0", "Add.node_1", "MatMul.node_2"])
+        self.assertEqual(list(ids), [0, 1, 2, 0])
+        self.assertEqual(list(durations), [500, 300, 700, 500])
+
+
+class AnalyzeProfileNvtxTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.profile_path = os.path.join(self.temp_dir.name, "profile.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _analyze(self, content: str, **kwargs) -> profile_analysis.ModelProfile:
+        with open(self.profile_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return profile_analysis.analyze_profile_nvtx(self.profile_path, 1, **kwargs)
+
+    def test_empty_profile_gives_empty_report(self):
+        model_profile = self._analyze("", use_cache=False)
+        self.assertEqual(model_profile.op_profiles, [])
+        self.assertEqual(model_profile.total_duration(), 0)
+
+    def _assert_same_op_profiles(
+        self, actual: profile_analysis.ModelProfile, expected: profile_analysis.ModelProfile
+    ):
+        self.assertEqual(list(actual.op_profiles_dict), list(expected.op_profiles_dict))
+        for op_type, expected_profile in expected.op_profiles_dict.items():
+            actual_profile = actual.op_profiles_dict[op_type]
+            self.assertEqual(actual_profile.names, expected_profile.names)
+            self.assertEqual(
+                actual_profile.durations.tolist(), expected_profile.durations.tolist()
+            )
+            self.assertEqual(actual_profile.total_count(), expected_profile.total_count())
+            self.assertEqual(
+                actual_profile.total_duration(), expected_profile.total_duration()
+            )
+
+    def _nvtx_profile_content(self, trailing_newline: bool) -> str:
+        lines = [_HEADER_LINE]
+        for i in range(2):
+            for op_type, count in (("MatMul", 3), ("Add", 2), ("Relu", 1)):
+                for j in range(count):
+                    timestamp = 1000 * i + 100 * j
+                    lines.append(
+                        '{"Type":59,"NvtxEvent":{"Type":59,'
+                        f'"Timestamp":"{timestamp}","Text":"{op_type}.node_{j}",'
+                        f'"EndTimestamp":"{timestamp + 10 * (i + 1) + j}"}}}}'
+                    )
+            lines.append(_CUDA_LINE)
+        lines.append(_ESCAPED_NVTX_LINE)
+        lines.append(_ESCAPED_NVTX_LINE)
+        content = "\n".join(lines)
+        return content + "\n" if trailing_newline else content
+
+    def test_parallel_parsing_matches_serial_parsing(self):
+        for trailing_newline in (True, False):
+            for num_workers in (2, 3, 7, 100):
+                with self.subTest(trailing_newline=trailing_newline, num_workers=num_workers):
+                    content = self._nvtx_profile_content(trailing_newline)
+                    expected = self._analyze(content, num_workers=1, use_cache=False)
+                    with unittest.mock.patch.object(
+                        profile_analysis, "_MIN_PARALLEL_CHUNK_SIZE", 1
+                    ):
+                        actual = self._analyze(
+                            content, num_workers=num_workers, use_cache=False
+                        )
+                    self._assert_same_op_profiles(actual, expected)
+
+    def test_split_into_line_chunks_ends_chunks_at_line_ends(self):
+        for trailing_newline in (True, False):
+            with self.subTest(trailing_newline=trailing_newline):
+                content = self._nvtx_profile_content(trailing_newline).encode()
+                with open(self.profile_path, "wb") as f:
+                    f.write(content)
+                # More chunks than lines puts the last boundary at the end of the file.
+                boundaries = profile_analysis._split_into_line_chunks(self.profile_path, 100)
+                self.assertEqual(boundaries[0], 0)
+                self.assertEqual(boundaries[-1], len(content))
+                self.assertEqual(boundaries, sorted(boundaries))
+                for boundary in boundaries[1:-1]:
+                    self.assertEqual(content[boundary - 1 : boundary], b"\n")
+
+
+class ParsedProfileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.profile_path = os.path.join(self.temp_dir.name, "profile.json")
+        self.cache_path = f"{self.profile_path}.parsed.pkl"
+        with open(self.profile_path, "w", encoding="utf-8") as f:
+            f.write("\n".join([_NVTX_LINE, _ESCAPED_NVTX_LINE, _NVTX_LINE]) + "\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _analyze(self) -> profile_analysis.ModelProfile:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return profile_analysis.analyze_profile_nvtx(self.profile_path, 1)
+
+    def _assert_expected_report(self, model_profile: profile_analysis.ModelProfile):
+        self.assertEqual(model_profile.op_count("MatMul"), 1)
+        self.assertEqual(model_profile.op_profiles_dict["MatMul"].names, ["MatMul.node_0"])
+        self.assertEqual(model_profile.op_count("Add"), 1)
+
+    def test_cached_profile_is_reused_without_parsing(self):
+        self._analyze()
+        self.assertTrue(os.path.exists(self.cache_path))
+        with unittest.mock.patch.object(
+            profile_analysis, "_parse_nvtx_profile", side_effect=AssertionError
+        ):
+            self._assert_expected_report(self._analyze())
+
+    def test_cache_does_not_reference_module_classes(self):
+        self._analyze()
+        with open(self.cache_path, "rb") as f:
+            self.assertNotIn(b"ProfileEntry", f.read())
+
+    def test_broken_cache_is_parsed_again(self):
+        cache_key = profile_analysis._profile_cache_key(self.profile_path)
+        for content in (
+            b"",
+            b"garbage",
+            pickle.dumps(("key", None))[:-3],
+            pickle.dumps((cache_key, [("MatMul", ["a"], None)])),
+        ):
+            with self.subTest(content=content):
+                with open(self.cache_path, "wb") as f:
+                    f.write(content)
+                self._assert_expected_report(self._analyze())
+
+    def test_unwritable_cache_is_skipped(self):
+        with unittest.mock.patch.object(os, "replace", side_effect=PermissionError):
+            self._assert_expected_report(self._analyze())
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.assertEqual(os.listdir(self.temp_dir.name), ["profile.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()